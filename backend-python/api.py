@@ -20,6 +20,7 @@ from main import (
     simulate_event_and_payout,
 )
 from lib.premium_math import HAZARD_CONFIG, load_site_parameters
+from lib.fetcher import breaker_state
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -312,7 +313,8 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "api": "operational"
+        "api": "operational",
+        "oracle_breaker": breaker_state()
     }
 
 
@@ -1,7 +1,226 @@
 """Distribution classes and builder for parametric insurance."""
 
+import functools
+import math
+
 import numpy as np
 from scipy import stats
+from scipy.special import expit, logit, ndtr, ndtri
+
+
+# ── Scalar math kernels ───────────────────────────────────────────────
+# Self-contained pure-math versions of the hot density/CDF expressions.
+# For the scalar arguments the premium path uses, these avoid the
+# ndarray round trip entirely.
+
+_SQRT2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# ndtri(0.841) / ndtri(0.159): z-scores of the interquantile spread used
+# by the std() approximations, precomputed so std() costs no ppf calls.
+_Z_HI = 0.9985762706156592
+_Z_LO = -0.9985762706156592
+
+
+def _norm_cdf(z: float) -> float:
+    """Standard normal CDF via math.erfc (no scipy dispatch)."""
+    return 0.5 * math.erfc(-z / _SQRT2)
+
+
+def _logitnormal_cdf(x: float, mu: float, sigma: float) -> float:
+    x = min(max(x, 1e-12), 1 - 1e-12)
+    return _norm_cdf((math.log(x / (1.0 - x)) - mu) / sigma)
+
+
+def _logitnormal_pdf(x: float, mu: float, sigma: float) -> float:
+    x = min(max(x, 1e-12), 1 - 1e-12)
+    z = (math.log(x / (1.0 - x)) - mu) / sigma
+    return math.exp(-0.5 * z * z) * _INV_SQRT_2PI / sigma / (x * (1.0 - x))
+
+
+class FastWeibullMin:
+    """
+    Weibull (minimum) distribution with closed-form CDF/SF/PDF/PPF.
+
+    Mirrors the scipy.stats.weibull_min frozen-distribution interface but
+    evaluates the closed forms directly, skipping scipy's distribution
+    infrastructure on the premium hot path.
+    """
+
+    def __init__(self, c: float, loc: float, scale: float):
+        self.c = c
+        self.loc = loc
+        self.scale = scale
+
+    def sf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            return math.exp(-(z ** self.c)) if z > 0 else 1.0
+        z = np.maximum((np.asarray(x, dtype=float) - self.loc) / self.scale, 0.0)
+        return np.exp(-(z ** self.c))
+
+    def cdf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            return -math.expm1(-(z ** self.c)) if z > 0 else 0.0
+        z = np.maximum((np.asarray(x, dtype=float) - self.loc) / self.scale, 0.0)
+        return -np.expm1(-(z ** self.c))
+
+    def pdf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            if z <= 0:
+                return 0.0
+            return (self.c / self.scale) * z ** (self.c - 1) * math.exp(-(z ** self.c))
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        zp = np.maximum(z, 1e-300)
+        with np.errstate(over="ignore"):
+            dens = (self.c / self.scale) * zp ** (self.c - 1) * np.exp(-(zp ** self.c))
+        return np.where(z > 0, dens, 0.0)
+
+    def ppf(self, q):
+        if isinstance(q, (int, float)):
+            return self.loc + self.scale * (-math.log1p(-q)) ** (1.0 / self.c)
+        return self.loc + self.scale * (-np.log1p(-np.asarray(q, dtype=float))) ** (1.0 / self.c)
+
+    def std(self):
+        g1 = math.gamma(1.0 + 1.0 / self.c)
+        g2 = math.gamma(1.0 + 2.0 / self.c)
+        return self.scale * math.sqrt(max(g2 - g1 * g1, 0.0))
+
+
+class FastGEV:
+    """
+    Generalized extreme value distribution (scipy genextreme parameterization,
+    shape c = -xi) with closed-form CDF/SF/PDF/PPF.
+    """
+
+    def __init__(self, c: float, loc: float, scale: float):
+        self.c = c
+        self.loc = loc
+        self.scale = scale
+
+    def _t(self, z):
+        # t(x) such that cdf = exp(-t); support handled by clipping 1 - c*z
+        # at a tiny positive value (yields cdf -> 1 above an upper endpoint,
+        # cdf -> 0 below a lower endpoint; the overflow to inf for c < 0 is
+        # the intended limit).
+        if abs(self.c) < 1e-12:
+            return np.exp(-z)
+        base = np.maximum(1.0 - self.c * z, 1e-300)
+        with np.errstate(over="ignore"):
+            return base ** (1.0 / self.c)
+
+    def _t_scalar(self, z: float) -> float:
+        if abs(self.c) < 1e-12:
+            return math.exp(-z)
+        base = 1.0 - self.c * z
+        if base <= 0.0:
+            # Outside the support: above the upper endpoint (c > 0) the
+            # cdf is 1 (t = 0); below the lower endpoint (c < 0) it is 0
+            # (t = inf). math.pow would overflow on the latter.
+            return 0.0 if self.c > 0 else math.inf
+        return base ** (1.0 / self.c)
+
+    def cdf(self, x):
+        if isinstance(x, (int, float)):
+            return math.exp(-self._t_scalar((x - self.loc) / self.scale))
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        return np.exp(-self._t(z))
+
+    def sf(self, x):
+        if isinstance(x, (int, float)):
+            return -math.expm1(-self._t_scalar((x - self.loc) / self.scale))
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        return -np.expm1(-self._t(z))
+
+    def pdf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            if abs(self.c) >= 1e-12 and 1.0 - self.c * z <= 0:
+                return 0.0
+            t = self._t_scalar(z)
+            return (t ** (1.0 - self.c)) * math.exp(-t) / self.scale
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        t = self._t(z)
+        with np.errstate(over="ignore", invalid="ignore"):
+            dens = (t ** (1.0 - self.c)) * np.exp(-t) / self.scale
+        if abs(self.c) < 1e-12:
+            return dens
+        return np.where(1.0 - self.c * z > 0, dens, 0.0)
+
+    def ppf(self, q):
+        if isinstance(q, (int, float)):
+            t = -math.log(q)
+            if abs(self.c) < 1e-12:
+                return self.loc - self.scale * math.log(t)
+            return self.loc + self.scale * (1.0 - t ** self.c) / self.c
+        t = -np.log(np.asarray(q, dtype=float))
+        if abs(self.c) < 1e-12:
+            return self.loc - self.scale * np.log(t)
+        return self.loc + self.scale * (1.0 - t ** self.c) / self.c
+
+    def std(self):
+        if abs(self.c) < 1e-8:
+            return self.scale * math.pi / math.sqrt(6.0)
+        if self.c > -0.5:
+            g1 = math.gamma(1.0 + self.c)
+            g2 = math.gamma(1.0 + 2.0 * self.c)
+            return self.scale * math.sqrt(max(g2 - g1 * g1, 0.0)) / abs(self.c)
+        # Infinite variance regime: fall back to an interquantile spread.
+        return float(self.ppf(0.841) - self.ppf(0.159)) / 2.0
+
+
+class FastJohnsonSU:
+    """
+    Johnson SU distribution with CDF/SF/PDF/PPF expressed directly through
+    the normal CDF (scipy.special.ndtr) on a + b*arcsinh(z).
+    """
+
+    def __init__(self, a: float, b: float, loc: float, scale: float):
+        self.a = a
+        self.b = b
+        self.loc = loc
+        self.scale = scale
+
+    def _u(self, x):
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        return self.a + self.b * np.arcsinh(z)
+
+    def cdf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            return _norm_cdf(self.a + self.b * math.asinh(z))
+        return ndtr(self._u(x))
+
+    def sf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            return _norm_cdf(-(self.a + self.b * math.asinh(z)))
+        return ndtr(-self._u(x))
+
+    def pdf(self, x):
+        if isinstance(x, (int, float)):
+            z = (x - self.loc) / self.scale
+            u = self.a + self.b * math.asinh(z)
+            return (
+                self.b * _INV_SQRT_2PI / self.scale
+                / math.sqrt(z * z + 1.0)
+                * math.exp(-0.5 * u * u)
+            )
+        z = (np.asarray(x, dtype=float) - self.loc) / self.scale
+        u = self.a + self.b * np.arcsinh(z)
+        return (
+            self.b / (self.scale * np.sqrt(2.0 * np.pi))
+            / np.sqrt(z * z + 1.0)
+            * np.exp(-0.5 * u * u)
+        )
+
+    def ppf(self, q):
+        return self.loc + self.scale * np.sinh((ndtri(np.asarray(q, dtype=float)) - self.a) / self.b)
+
+    def std(self):
+        return float(self.ppf(0.841) - self.ppf(0.159)) / 2.0
 
 
 class LogitNormalDist:
@@ -16,51 +235,72 @@ class LogitNormalDist:
         self.mu = mu
         self.sigma = sigma
 
-    def cdf(self, x):
+    def _z(self, x):
         x = np.clip(x, 1e-12, 1 - 1e-12)
-        logit_x = np.log(x / (1 - x))
-        return stats.norm.cdf(logit_x, self.mu, self.sigma)
+        return (logit(x) - self.mu) / self.sigma
+
+    def cdf(self, x):
+        if isinstance(x, (int, float)):
+            return _logitnormal_cdf(x, self.mu, self.sigma)
+        return ndtr(self._z(x))
 
     def sf(self, x):
-        return 1.0 - self.cdf(x)
+        if isinstance(x, (int, float)):
+            return 1.0 - _logitnormal_cdf(x, self.mu, self.sigma)
+        return ndtr(-self._z(x))
 
     def pdf(self, x):
+        if isinstance(x, (int, float)):
+            return _logitnormal_pdf(x, self.mu, self.sigma)
         x = np.clip(x, 1e-12, 1 - 1e-12)
-        logit_x = np.log(x / (1 - x))
-        return stats.norm.pdf(logit_x, self.mu, self.sigma) / (x * (1 - x))
+        z = (logit(x) - self.mu) / self.sigma
+        phi = np.exp(-0.5 * z * z) / (self.sigma * np.sqrt(2.0 * np.pi))
+        return phi / (x * (1 - x))
 
     def ppf(self, q):
-        z = stats.norm.ppf(q, self.mu, self.sigma)
-        return 1.0 / (1.0 + np.exp(-z))
+        return expit(self.mu + self.sigma * ndtri(q))
 
     def std(self):
-        return float(self.ppf(0.841) - self.ppf(0.159)) / 2.0
+        hi = 1.0 / (1.0 + math.exp(-(self.mu + self.sigma * _Z_HI)))
+        lo = 1.0 / (1.0 + math.exp(-(self.mu + self.sigma * _Z_LO)))
+        return (hi - lo) / 2.0
 
 
 def build_distribution(family: str, params: dict):
-    """Reconstruct a frozen scipy distribution from stored parameters.
+    """Reconstruct a distribution object from stored parameters.
+
+    The heavily used families (genextreme, weibull_min, johnsonsu,
+    logitnormal) get lightweight closed-form classes; the rest fall back
+    to frozen scipy distributions. Results are memoized per
+    (family, params), so repeated quotes at the same site reuse the
+    constructed object.
 
     Supports all families that can appear in site_parameters.json:
         genextreme, weibull_min, logitnormal, johnsonsu,
         lognorm, gamma, norm, gumbel_r, gumbel_l
     """
-    if family == "genextreme":
-        return stats.genextreme(c=params["c"], loc=params["loc"], scale=params["scale"])
-    elif family == "weibull_min":
-        return stats.weibull_min(c=params["c"], loc=params["loc"], scale=params["scale"])
-    elif family == "logitnormal":
-        return LogitNormalDist(mu=params["mu"], sigma=params["sigma"])
-    elif family == "johnsonsu":
-        return stats.johnsonsu(a=params["a"], b=params["b"], loc=params["loc"], scale=params["scale"])
-    elif family == "lognorm":
-        return stats.lognorm(s=params["s"], loc=params["loc"], scale=params["scale"])
-    elif family == "gamma":
-        return stats.gamma(a=params["a"], loc=params["loc"], scale=params["scale"])
-    elif family == "norm":
-        return stats.norm(loc=params["loc"], scale=params["scale"])
-    elif family == "gumbel_r":
-        return stats.gumbel_r(loc=params["loc"], scale=params["scale"])
-    elif family == "gumbel_l":
-        return stats.gumbel_l(loc=params["loc"], scale=params["scale"])
-    else:
-        raise ValueError(f"Unknown distribution family: '{family}'")
+    return _build_distribution_cached(family, tuple(sorted(params.items())))
+
+
+# Per-family constructor dispatch table: one dict lookup instead of a
+# string-compare ladder.
+_BUILDERS = {
+    "genextreme": lambda p: FastGEV(c=p["c"], loc=p["loc"], scale=p["scale"]),
+    "weibull_min": lambda p: FastWeibullMin(c=p["c"], loc=p["loc"], scale=p["scale"]),
+    "logitnormal": lambda p: LogitNormalDist(mu=p["mu"], sigma=p["sigma"]),
+    "johnsonsu": lambda p: FastJohnsonSU(a=p["a"], b=p["b"], loc=p["loc"], scale=p["scale"]),
+    "lognorm": lambda p: stats.lognorm(s=p["s"], loc=p["loc"], scale=p["scale"]),
+    "gamma": lambda p: stats.gamma(a=p["a"], loc=p["loc"], scale=p["scale"]),
+    "norm": lambda p: stats.norm(loc=p["loc"], scale=p["scale"]),
+    "gumbel_r": lambda p: stats.gumbel_r(loc=p["loc"], scale=p["scale"]),
+    "gumbel_l": lambda p: stats.gumbel_l(loc=p["loc"], scale=p["scale"]),
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_distribution_cached(family: str, params_items: tuple):
+    try:
+        builder = _BUILDERS[family]
+    except KeyError:
+        raise ValueError(f"Unknown distribution family: '{family}'") from None
+    return builder(dict(params_items))
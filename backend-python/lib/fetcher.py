@@ -1,11 +1,18 @@
 """Oracle data fetching: API calls, aggregation, Thornthwaite PET, trigger evaluation."""
 
+import asyncio
+import functools
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, timedelta
-from collections import defaultdict
 
+import httpx
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # ── API configuration ─────────────────────────────────────────────────
@@ -52,26 +59,85 @@ HAZARD_API_CONFIG = {
 
 # ── HTTP with retry ───────────────────────────────────────────────────
 
-def get_json(url: str, params: dict, timeout: int = 60, max_retries: int = 3) -> dict:
-    """GET request with exponential backoff retry."""
+# Shared session: keep-alive connection pooling avoids a fresh TCP+TLS
+# handshake per request, and makes concurrent fetches share the pool.
+# Retries are handled by urllib3's status-aware Retry (which also honors
+# Retry-After on 429s) instead of a Python-level sleep loop.
+_RETRY_KWARGS = dict(
+    total=3,
+    backoff_factor=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    respect_retry_after_header=True,
+)
+try:
+    _RETRY = Retry(backoff_jitter=1.0, **_RETRY_KWARGS)
+except TypeError:  # urllib3 < 2.0 has no backoff_jitter
+    _RETRY = Retry(**_RETRY_KWARGS)
+
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=_RETRY)
+)
+
+# Separate connect/read deadlines: a hung connect should fail fast (and
+# let the adapter retry) rather than eating the whole read budget.
+_TIMEOUT = (3.05, 60)
+
+
+def get_json(url: str, params: dict, timeout=_TIMEOUT) -> dict:
+    """GET request; retries/backoff are handled by the session adapter."""
+    r = _SESSION.get(url, params=params, timeout=timeout)
+    r.raise_for_status()
+    return r.json()
+
+
+# Shared async clients, created lazily and keyed per event loop: httpx
+# connections belong to the loop they were opened in, and sync adapters
+# like check_event_and_payout_many spin up a fresh loop per call. The
+# weak keying means a dead loop's entry disappears with the loop (its
+# client is then garbage-collected), so short-lived loops neither
+# accumulate clients nor hand a recycled-id loop someone else's
+# connections. One-shot scopes should still call aclose_async_client()
+# before their loop exits for a graceful shutdown.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60, connect=3.05),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the running loop's shared client, if one was created."""
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def get_json_async(url: str, params: dict, max_retries: int = 3) -> dict:
+    """Async GET with the same exponential backoff policy as get_json."""
+    client = _get_async_client()
     for attempt in range(max_retries + 1):
         try:
-            r = requests.get(url, params=params, timeout=timeout)
+            r = await client.get(url, params=params)
             if r.status_code == 200:
                 return r.json()
-            if r.status_code == 429 and attempt < max_retries:
-                wait = 2 ** (attempt + 1)
-                time.sleep(wait)
-                continue
-            if r.status_code in (500, 502, 503, 504) and attempt < max_retries:
-                wait = 2 ** (attempt + 1)
-                time.sleep(wait)
+            if r.status_code in (429, 500, 502, 503, 504) and attempt < max_retries:
+                await asyncio.sleep(2 ** (attempt + 1))
                 continue
             r.raise_for_status()
-        except requests.exceptions.RequestException as exc:
+        except httpx.HTTPError:
             if attempt == max_retries:
                 raise
-            time.sleep(2 ** (attempt + 1))
+            await asyncio.sleep(2 ** (attempt + 1))
     raise RuntimeError(f"Max retries exceeded for {url}")
 
 
@@ -81,38 +147,55 @@ def compute_thornthwaite_deficit(dates, temps, precips) -> tuple:
     """
     Compute monthly water deficit D_mm = precip - PET (Thornthwaite).
 
+    Pure numpy: daily values are grouped by month with a bincount-based
+    reduction instead of building a pandas DataFrame and resampling.
+
     Returns
     -------
     (monthly_dates, D_mm_values) : tuple of lists
     """
-    import pandas as pd
+    days = np.asarray(dates, dtype="datetime64[D]")
+    temp = np.asarray(
+        [np.nan if v is None else float(v) for v in temps], dtype=np.float64
+    )
+    precip = np.asarray(
+        [np.nan if v is None else float(v) for v in precips], dtype=np.float64
+    )
 
-    df = pd.DataFrame({
-        "date": pd.to_datetime(dates),
-        "temp_c": temps,
-        "precip_mm": precips,
-    }).dropna()
+    valid = ~(np.isnan(temp) | np.isnan(precip))
+    days, temp, precip = days[valid], temp[valid], precip[valid]
 
-    if len(df) < 30:
+    if days.size < 30:
         return [], []
 
-    m = df.resample("MS", on="date").agg(
-        temp_c=("temp_c", "mean"),
-        precip_mm=("precip_mm", "sum"),
-    )
+    months, inv = np.unique(days.astype("datetime64[M]"), return_inverse=True)
+    counts = np.bincount(inv)
+    temp_monthly = np.bincount(inv, weights=temp) / counts
+    precip_monthly = np.bincount(inv, weights=precip)
 
-    T = m["temp_c"].clip(lower=0)
+    T = np.maximum(temp_monthly, 0.0)
     I = (T / 5.0) ** 1.514
-    annual_I = I.rolling(12, center=True).sum().bfill().ffill()
+
+    # Centered 12-month heat-index sum; edge months reuse the nearest
+    # complete window (the bfill/ffill behavior of the old rolling sum).
+    n = I.size
+    if n >= 12:
+        window_sums = np.convolve(I, np.ones(12), mode="valid")
+        annual_I = np.empty(n)
+        annual_I[6:6 + window_sums.size] = window_sums
+        annual_I[:6] = window_sums[0]
+        annual_I[6 + window_sums.size:] = window_sums[-1]
+    else:
+        annual_I = np.full(n, I.sum())
+
     a = (6.75e-7 * annual_I**3) - (7.71e-5 * annual_I**2) + (1.79e-2 * annual_I) + 0.492
-    annual_I_safe = annual_I.replace(0, np.nan).bfill().ffill()
+    annual_I_safe = np.where(annual_I > 0, annual_I, 1e-6)
 
-    m["pet_mm_month"] = 16.0 * ((10.0 * T) / annual_I_safe) ** a
-    m["D_mm"] = m["precip_mm"] - m["pet_mm_month"]
+    pet_mm_month = 16.0 * ((10.0 * T) / annual_I_safe) ** a
+    D_mm = precip_monthly - pet_mm_month
 
-    dates_out = [d.strftime("%Y-%m-%d") for d in m.index]
-    values_out = m["D_mm"].tolist()
-    return dates_out, values_out
+    dates_out = [f"{m}-01" for m in months]
+    return dates_out, D_mm.tolist()
 
 
 # ── Monthly aggregation ──────────────────────────────────────────────
@@ -121,35 +204,134 @@ def aggregate_monthly(dates: list, values: list, method: str) -> list:
     """
     Aggregate daily values to monthly.
 
+    Single-pass numpy group-by: month keys come from truncating the ISO
+    date strings, and the per-month reduction runs as one vectorized
+    reduceat/bincount instead of a Python dict-and-loop.
+
     Returns
     -------
     list of (date_str, value) tuples, sorted by date.
     """
-    monthly = defaultdict(list)
-    for d, v in zip(dates, values):
-        if v is None:
-            continue
-        month_key = d[:7] + "-01"
-        monthly[month_key].append(float(v))
-
-    result = []
-    for month_key in sorted(monthly.keys()):
-        vals = monthly[month_key]
-        if not vals:
-            continue
-        if method == "max":
-            agg = max(vals)
-        elif method == "mean":
-            agg = sum(vals) / len(vals)
+    if method not in ("max", "mean"):
+        raise ValueError(f"Unknown method: {method}")
+
+    n = min(len(dates), len(values))
+    vals = np.asarray(
+        [np.nan if v is None else float(v) for v in values[:n]], dtype=np.float64
+    )
+    valid = ~np.isnan(vals)
+    if not valid.any():
+        return []
+
+    vals = vals[valid]
+    # Casting "YYYY-MM-DD" strings to U7 truncates to the month key.
+    month_keys = np.asarray(dates[:n], dtype="U10")[valid].astype("U7")
+    keys, inv = np.unique(month_keys, return_inverse=True)
+
+    if method == "max":
+        order = np.argsort(inv, kind="stable")
+        starts = np.searchsorted(inv[order], np.arange(keys.size))
+        agg = np.maximum.reduceat(vals[order], starts)
+    else:
+        agg = np.bincount(inv, weights=vals) / np.bincount(inv)
+
+    return [(f"{k}-01", float(v)) for k, v in zip(keys, agg)]
+
+
+# ── Circuit breaker ──────────────────────────────────────────────────
+
+# When Open-Meteo is persistently failing, retries only stack timeouts.
+# After _BREAKER_FAIL_MAX consecutive failures the breaker opens and
+# fetches fail fast with a circuit_open observation for
+# _BREAKER_RESET_S; the first call after the cool-down probes upstream
+# and either closes the breaker or re-opens it.
+_BREAKER_LOCK = threading.Lock()
+_BREAKER_FAIL_MAX = 5
+_BREAKER_RESET_S = 60
+_breaker_failures = 0
+_breaker_opened_at = None
+
+
+def _breaker_allows() -> bool:
+    with _BREAKER_LOCK:
+        return (
+            _breaker_opened_at is None
+            or time.monotonic() - _breaker_opened_at >= _BREAKER_RESET_S
+        )
+
+
+def _breaker_record(success: bool) -> None:
+    global _breaker_failures, _breaker_opened_at
+    with _BREAKER_LOCK:
+        if success:
+            _breaker_failures = 0
+            _breaker_opened_at = None
         else:
-            raise ValueError(f"Unknown method: {method}")
-        result.append((month_key, agg))
+            _breaker_failures += 1
+            if _breaker_failures >= _BREAKER_FAIL_MAX:
+                _breaker_opened_at = time.monotonic()
 
-    return result
+
+def breaker_state() -> str:
+    """"closed" | "open" | "half_open" — for health reporting."""
+    with _BREAKER_LOCK:
+        if _breaker_opened_at is None:
+            return "closed"
+        if time.monotonic() - _breaker_opened_at < _BREAKER_RESET_S:
+            return "open"
+        return "half_open"
+
+
+def _circuit_open_observation(hazard: str, lat: float, lon: float) -> dict:
+    return {
+        "hazard": hazard,
+        "lat": lat,
+        "lon": lon,
+        "error": "circuit_open",
+        "source": HAZARD_API_CONFIG[hazard]["source"],
+    }
 
 
 # ── Main fetch function ───────────────────────────────────────────────
 
+# Observations for a (lat, lon, hazard, lookback) tuple only change once
+# a day, so cache responses in-process and skip the HTTP round trip.
+# Coordinates are quantized to 2 decimals (~1 km) so nearby queries
+# coalesce onto one entry. Size-bounded: expired entries are pruned on
+# insert, then the oldest entries go if the cap is still exceeded.
+_FETCH_CACHE: dict = {}
+_FETCH_CACHE_LOCK = threading.Lock()
+_FETCH_CACHE_TTL_S = 6 * 3600
+_FETCH_CACHE_MAX = 1024
+
+
+def _fetch_cache_get(cache_key: tuple):
+    now = time.monotonic()
+    with _FETCH_CACHE_LOCK:
+        cached = _FETCH_CACHE.get(cache_key)
+        if cached is not None and now - cached[0] < _FETCH_CACHE_TTL_S:
+            return cached[1]
+    return None
+
+
+def _fetch_cache_put(cache_key: tuple, result: dict) -> None:
+    now = time.monotonic()
+    with _FETCH_CACHE_LOCK:
+        if len(_FETCH_CACHE) >= _FETCH_CACHE_MAX:
+            expired = [k for k, (ts, _) in _FETCH_CACHE.items() if now - ts >= _FETCH_CACHE_TTL_S]
+            for k in expired:
+                del _FETCH_CACHE[k]
+            while len(_FETCH_CACHE) >= _FETCH_CACHE_MAX:
+                del _FETCH_CACHE[min(_FETCH_CACHE, key=lambda k: _FETCH_CACHE[k][0])]
+        _FETCH_CACHE[cache_key] = (now, result)
+
+
+def clear_fetch_cache() -> None:
+    """Drop all cached observations (e.g. to force a fresh oracle read)."""
+    with _FETCH_CACHE_LOCK:
+        _FETCH_CACHE.clear()
+
+
 def fetch_latest_observation(
     lat: float,
     lon: float,
@@ -172,24 +354,110 @@ def fetch_latest_observation(
         )
 
     cfg = HAZARD_API_CONFIG[hazard]
-    today = date.today()
 
+    cache_key = _fetch_cache_key(lat, lon, hazard, lookback_months)
+    cached = _fetch_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    if not _breaker_allows():
+        return _circuit_open_observation(hazard, lat, lon)
+
+    params = _build_fetch_params(lat, lon, hazard, lookback_months)
+
+    try:
+        data = get_json(cfg["url"], params)
+    except requests.RequestException:
+        _breaker_record(False)
+        raise
+    _breaker_record(True)
+
+    result = _parse_observation(data, hazard, lat, lon)
+
+    if "error" not in result:
+        _fetch_cache_put(cache_key, result)
+
+    return result
+
+
+async def fetch_latest_observation_async(
+    lat: float,
+    lon: float,
+    hazard: str,
+    lookback_months: int = 3,
+) -> dict:
+    """
+    Async variant of fetch_latest_observation, sharing the same cache,
+    request building and response parsing. Independent calls can be
+    gathered concurrently over the shared httpx client.
+    """
+    if hazard not in HAZARD_API_CONFIG:
+        raise ValueError(
+            f"Unknown hazard: '{hazard}'. "
+            f"Choose from: {list(HAZARD_API_CONFIG.keys())}"
+        )
+
+    cfg = HAZARD_API_CONFIG[hazard]
+
+    cache_key = _fetch_cache_key(lat, lon, hazard, lookback_months)
+    cached = _fetch_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    if not _breaker_allows():
+        return _circuit_open_observation(hazard, lat, lon)
+
+    params = _build_fetch_params(lat, lon, hazard, lookback_months)
+
+    try:
+        data = await get_json_async(cfg["url"], params)
+    except (httpx.HTTPError, RuntimeError):
+        _breaker_record(False)
+        raise
+    _breaker_record(True)
+
+    result = _parse_observation(data, hazard, lat, lon)
+
+    if "error" not in result:
+        _fetch_cache_put(cache_key, result)
+
+    return result
+
+
+def _fetch_cache_key(lat: float, lon: float, hazard: str, lookback_months: int) -> tuple:
+    return (round(lat, 2), round(lon, 2), hazard, lookback_months, date.today().isoformat())
+
+
+@functools.lru_cache(maxsize=8)
+def _date_window(hazard: str, lookback_months: int, today_iso: str) -> tuple:
+    """(start_iso, end_iso) request window, memoized per calendar day."""
     if hazard == "drought":
         lookback_months = max(lookback_months, 14)
 
+    today = date.fromisoformat(today_iso)
     start_date = (today - timedelta(days=lookback_months * 31)).replace(day=1)
+    return start_date.isoformat(), today_iso
+
+
+def _build_fetch_params(lat: float, lon: float, hazard: str, lookback_months: int) -> dict:
+    cfg = HAZARD_API_CONFIG[hazard]
+    start_iso, end_iso = _date_window(hazard, lookback_months, date.today().isoformat())
 
     params = {
         "latitude": lat,
         "longitude": lon,
         "daily": cfg["daily_vars"],
-        "start_date": start_date.isoformat(),
-        "end_date": today.isoformat(),
+        "start_date": start_iso,
+        "end_date": end_iso,
         "timezone": "UTC",
     }
     params.update(cfg.get("extra_params", {}))
+    return params
+
 
-    data = get_json(cfg["url"], params)
+def _parse_observation(data: dict, hazard: str, lat: float, lon: float) -> dict:
+    """Turn a raw Open-Meteo daily payload into the observation dict."""
+    cfg = HAZARD_API_CONFIG[hazard]
 
     daily = data.get("daily", {})
     times = daily.get("time", [])
@@ -249,18 +517,24 @@ def fetch_latest_observation(
 # ── Batch fetch ──────────────────────────────────────────────────────
 
 def fetch_all_hazards(lat: float, lon: float, lookback_months: int = 3) -> dict:
-    """Fetch the latest observation for ALL hazards at a site."""
+    """Fetch the latest observation for ALL hazards at a site, in parallel."""
     results = {}
-    for hazard in HAZARD_API_CONFIG:
-        try:
-            results[hazard] = fetch_latest_observation(lat, lon, hazard, lookback_months)
-        except Exception as e:
-            results[hazard] = {
-                "hazard": hazard,
-                "lat": lat,
-                "lon": lon,
-                "error": str(e),
-            }
+    with ThreadPoolExecutor(max_workers=len(HAZARD_API_CONFIG)) as executor:
+        futures = {
+            executor.submit(fetch_latest_observation, lat, lon, hazard, lookback_months): hazard
+            for hazard in HAZARD_API_CONFIG
+        }
+        for future in as_completed(futures):
+            hazard = futures[future]
+            try:
+                results[hazard] = future.result()
+            except Exception as e:
+                results[hazard] = {
+                    "hazard": hazard,
+                    "lat": lat,
+                    "lon": lon,
+                    "error": str(e),
+                }
     return results
 
 
@@ -1,9 +1,18 @@
 """Premium calculation helpers: conditional expectations and site parameter loading."""
 
 import json
+import math
+import os
 
 import numpy as np
-from scipy import integrate
+from scipy.special import gammainc, gammaincc
+
+try:  # optional: C-accelerated JSON parsing when available
+    import orjson
+except ImportError:
+    orjson = None
+
+from lib.distributions import FastGEV, FastWeibullMin, build_distribution
 
 
 # ── Hazard configuration ──────────────────────────────────────────────
@@ -34,48 +43,236 @@ HAZARD_CONFIG = {
 
 # ── Conditional expectations ──────────────────────────────────────────
 
+# Fixed 64-point Gauss-Legendre rule, computed once at import. The tail
+# integrands are smooth, so a fixed rule in one vectorized pdf() call
+# replaces the hundreds of scalar callbacks adaptive quadrature makes.
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(64)
+
+
+def _gauss_legendre(integrand, a: float, b: float) -> float:
+    """Integrate `integrand` over [a, b] with the fixed Gauss-Legendre rule."""
+    half = 0.5 * (b - a)
+    x = half * _GL_NODES + 0.5 * (b + a)
+    return float(half * np.sum(_GL_WEIGHTS * integrand(x)))
+
+
+# Integration bounds per distribution object. ppf at the extreme
+# quantiles (and std, for the non-finite fallback) are fixed properties
+# of a distribution, yet were recomputed on every conditional-expectation
+# call; distributions themselves are memoized, so a small identity-keyed
+# cache makes the bounds one-time work too.
+_TAIL_CACHE: dict = {}
+_TAIL_CACHE_MAX = 256
+
+
+def _tail_stats(dist) -> tuple:
+    """(lower_bound, upper_bound, std) for `dist`, computed once per object.
+
+    std is only evaluated when a bound is non-finite (it is only used to
+    construct the fallback bound).
+    """
+    entry = _TAIL_CACHE.get(id(dist))
+    if entry is None or entry[0] is not dist:
+        lb = float(dist.ppf(0.00001))
+        ub = float(dist.ppf(0.99999))
+        std = 0.0 if np.isfinite(lb) and np.isfinite(ub) else float(dist.std())
+        if len(_TAIL_CACHE) >= _TAIL_CACHE_MAX:
+            _TAIL_CACHE.clear()
+        entry = (dist, lb, ub, std)
+        _TAIL_CACHE[id(dist)] = entry
+    return entry[1], entry[2], entry[3]
+
+
+# Closed-form partial expectations E[(X - t)+] / E[(t - X)+] for the
+# families where the tail integral reduces to incomplete gamma functions.
+# These skip quadrature entirely; the remaining families keep the fixed
+# Gauss-Legendre rule.
+
+def _weibull_partial_above(dist, thr):
+    g = math.gamma(1.0 + 1.0 / dist.c)
+    z = np.maximum((np.asarray(thr, dtype=np.float64) - dist.loc) / dist.scale, 0.0)
+    zc = z ** dist.c
+    # (loc - t)*sf + scale * E[W ; W > z] with W standard Weibull; at z = 0
+    # this collapses to mean - t, covering thresholds below the support.
+    return (dist.loc - thr) * np.exp(-zc) + dist.scale * g * gammaincc(1.0 + 1.0 / dist.c, zc)
+
+
+def _weibull_partial_below(dist, thr):
+    g = math.gamma(1.0 + 1.0 / dist.c)
+    z = np.maximum((np.asarray(thr, dtype=np.float64) - dist.loc) / dist.scale, 0.0)
+    zc = z ** dist.c
+    return (thr - dist.loc) * (-np.expm1(-zc)) - dist.scale * g * gammainc(1.0 + 1.0 / dist.c, zc)
+
+
+def _gev_partial_above(dist, thr):
+    # With u(x) = (1 - c*z)^(1/c) and cdf = exp(-u), substituting u gives
+    # E[(X - t)+] = (scale/c) * [u_t^c * sf(t) - gamma(1+c) * P(1+c, u_t)].
+    c = dist.c
+    g = math.gamma(1.0 + c)
+    z = (np.asarray(thr, dtype=np.float64) - dist.loc) / dist.scale
+    base = 1.0 - c * z
+    oob = base <= 0.0
+    base = np.where(oob, 1.0, base)
+    ut = base ** (1.0 / c)
+    val = (dist.scale / c) * (base * (-np.expm1(-ut)) - g * gammainc(1.0 + c, ut))
+    if c > 0:
+        # base <= 0 means t is above the upper endpoint: nothing exceeds it.
+        return np.where(oob, 0.0, val)
+    # c < 0: base <= 0 means t is below the lower endpoint: E[(X-t)+] = mean - t.
+    mean = dist.loc + dist.scale * (1.0 - g) / c
+    return np.where(oob, mean - thr, val)
+
+
+def _gev_partial_below(dist, thr):
+    c = dist.c
+    g = math.gamma(1.0 + c)
+    z = (np.asarray(thr, dtype=np.float64) - dist.loc) / dist.scale
+    base = 1.0 - c * z
+    oob = base <= 0.0
+    base = np.where(oob, 1.0, base)
+    ut = base ** (1.0 / c)
+    val = (dist.scale / c) * (g * gammaincc(1.0 + c, ut) - base * np.exp(-ut))
+    if c > 0:
+        mean = dist.loc + dist.scale * (1.0 - g) / c
+        return np.where(oob, thr - mean, val)
+    return np.where(oob, 0.0, val)
+
+
+def _closed_partial(dist, thr, above: bool):
+    """Closed-form partial expectation, or None if no closed form applies."""
+    if isinstance(dist, FastWeibullMin):
+        return _weibull_partial_above(dist, thr) if above else _weibull_partial_below(dist, thr)
+    # GEV closed form needs a finite mean (c > -1); the Gumbel limit
+    # (c ~ 0) keeps quadrature to avoid the 1/c cancellation.
+    if isinstance(dist, FastGEV) and dist.c > -1.0 and abs(dist.c) >= 1e-12:
+        return _gev_partial_above(dist, thr) if above else _gev_partial_below(dist, thr)
+    return None
+
+
 def conditional_expectation_above(dist, threshold: float, exceedance_prob: float) -> float:
-    """E[X - threshold | X > threshold] via numerical integration."""
+    """E[X - threshold | X > threshold], closed-form where available."""
     if exceedance_prob < 1e-12:
         return 0.0
 
-    ub = dist.ppf(0.99999)
-    if np.isnan(ub) or np.isinf(ub):
-        ub = threshold + 10 * dist.std()
+    val = _closed_partial(dist, threshold, above=True)
+    if val is None:
+        _, ub, std = _tail_stats(dist)
+        if not np.isfinite(ub):
+            ub = threshold + 10 * std
+        val = _gauss_legendre(lambda x: (x - threshold) * dist.pdf(x), threshold, ub)
 
-    val, _ = integrate.quad(
-        lambda x: (x - threshold) * dist.pdf(x),
-        threshold, ub, limit=100,
-    )
-    return max(val / exceedance_prob, 0.0)
+    return max(float(val) / exceedance_prob, 0.0)
 
 
 def conditional_expectation_below(dist, threshold: float, exceedance_prob: float) -> float:
-    """E[threshold - X | X < threshold] via numerical integration."""
+    """E[threshold - X | X < threshold], closed-form where available."""
     if exceedance_prob < 1e-12:
         return 0.0
 
-    lb = dist.ppf(0.00001)
-    if np.isnan(lb) or np.isinf(lb):
-        lb = threshold - 10 * dist.std()
+    val = _closed_partial(dist, threshold, above=False)
+    if val is None:
+        lb, _, std = _tail_stats(dist)
+        if not np.isfinite(lb):
+            lb = threshold - 10 * std
+        val = _gauss_legendre(lambda x: (threshold - x) * dist.pdf(x), lb, threshold)
+
+    return max(float(val) / exceedance_prob, 0.0)
+
+
+def conditional_expectation_above_batch(dist, thresholds, exceedance_probs):
+    """
+    Vectorized E[X - t | X > t] for an array of thresholds.
+
+    Evaluates the Gauss-Legendre rule for every threshold in a single
+    dist.pdf call on a (nodes, n_thresholds) grid.
+    """
+    thr = np.asarray(thresholds, dtype=np.float64)
+    p = np.asarray(exceedance_probs, dtype=np.float64)
+
+    vals = _closed_partial(dist, thr, above=True)
+    if vals is None:
+        _, ub, std = _tail_stats(dist)
+        if not np.isfinite(ub):
+            ub = float(thr.max()) + 10 * std
+
+        half = 0.5 * (ub - thr)
+        x = half[None, :] * _GL_NODES[:, None] + 0.5 * (ub + thr)[None, :]
+        vals = half * np.sum(_GL_WEIGHTS[:, None] * (x - thr[None, :]) * dist.pdf(x), axis=0)
+
+    out = np.zeros_like(thr)
+    np.divide(vals, p, out=out, where=p >= 1e-12)
+    return np.maximum(out, 0.0)
 
-    val, _ = integrate.quad(
-        lambda x: (threshold - x) * dist.pdf(x),
-        lb, threshold, limit=100,
-    )
-    return max(val / exceedance_prob, 0.0)
+
+def conditional_expectation_below_batch(dist, thresholds, exceedance_probs):
+    """Vectorized E[t - X | X < t] for an array of thresholds."""
+    thr = np.asarray(thresholds, dtype=np.float64)
+    p = np.asarray(exceedance_probs, dtype=np.float64)
+
+    vals = _closed_partial(dist, thr, above=False)
+    if vals is None:
+        lb, _, std = _tail_stats(dist)
+        if not np.isfinite(lb):
+            lb = float(thr.min()) - 10 * std
+
+        half = 0.5 * (thr - lb)
+        x = half[None, :] * _GL_NODES[:, None] + 0.5 * (thr + lb)[None, :]
+        vals = half * np.sum(_GL_WEIGHTS[:, None] * (thr[None, :] - x) * dist.pdf(x), axis=0)
+
+    out = np.zeros_like(thr)
+    np.divide(vals, p, out=out, where=p >= 1e-12)
+    return np.maximum(out, 0.0)
 
 
 # ── Site parameters loader ────────────────────────────────────────────
 
+# path -> (mtime, sites). Unlike an lru_cache keyed on path alone, the
+# mtime key means a redeployed parameters file is picked up without a
+# process restart.
+_SITES_CACHE: dict = {}
+
+
 def load_site_parameters(path: str = "site_parameters.json") -> dict:
     """
     Load the site parameters JSON.
 
+    Cached per (path, mtime): repeated premium calls skip the disk read
+    and JSON parse, but a changed file is re-read automatically. Callers
+    must treat the returned dict as read-only.
+
     Returns
     -------
     dict
         Keys: site names. Values: dicts with lat, lon, city, hazards.
+        Converged hazard entries carry a prebuilt distribution object
+        under "_dist".
     """
-    with open(path) as f:
-        return json.load(f)
+    mtime = os.path.getmtime(path)
+    cached = _SITES_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    if orjson is not None:
+        with open(path, "rb") as f:
+            sites = orjson.loads(f.read())
+    else:
+        with open(path) as f:
+            sites = json.load(f)
+
+    # Freeze each per-hazard distribution once at load time; request
+    # handlers then reuse the object instead of rebuilding it per call.
+    for site in sites.values():
+        if not isinstance(site, dict):
+            continue
+        for hazard_data in site.get("hazards", {}).values():
+            if not hazard_data.get("converged", False):
+                continue
+            try:
+                hazard_data["_dist"] = build_distribution(
+                    hazard_data["distribution"], hazard_data["params"]
+                )
+            except (KeyError, ValueError):
+                continue
+
+    _SITES_CACHE[path] = (mtime, sites)
+    return sites
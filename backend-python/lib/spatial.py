@@ -2,33 +2,124 @@
 
 import math
 
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+_DEG2RAD = math.pi / 180.0
+_EARTH_DIAMETER_KM = 2.0 * 6371.0
+
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Haversine distance in km between two points."""
-    R = 6371.0
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2))
-        * math.sin(dlon / 2) ** 2
+    rlat1 = lat1 * _DEG2RAD
+    rlat2 = lat2 * _DEG2RAD
+    sin_dlat = math.sin((rlat2 - rlat1) * 0.5)
+    sin_dlon = math.sin((lon2 - lon1) * _DEG2RAD * 0.5)
+    a = sin_dlat * sin_dlat + math.cos(rlat1) * math.cos(rlat2) * sin_dlon * sin_dlon
+    # atan2 form is well-conditioned for antipodal points (a near 1),
+    # where asin(sqrt(a)) loses precision.
+    return _EARTH_DIAMETER_KM * math.atan2(math.sqrt(a), math.sqrt(1.0 - a))
+
+
+_EARTH_RADIUS_KM = 6371.0
+
+# Per-site-list spatial index, cached by object identity with the list
+# kept as a strong reference so a recycled id can never alias a different
+# list; capped to stay bounded if callers pass many ad-hoc lists.
+_INDEX_CACHE: dict = {}
+_INDEX_CACHE_MAX = 8
+
+
+def _unit_xyz(lat_rad, lon_rad):
+    """(n, 3) unit-sphere coordinates for radian lat/lon arrays."""
+    cos_lat = np.cos(lat_rad)
+    return np.column_stack(
+        (cos_lat * np.cos(lon_rad), cos_lat * np.sin(lon_rad), np.sin(lat_rad))
     )
-    return R * 2 * math.asin(math.sqrt(a))
+
+
+# Repeated query points (the same coordinates asked across all four
+# hazards, say) skip the tree entirely via a per-index memo.
+_QUERY_MEMO_MAX = 4096
+
+
+def _site_index(sites: list) -> tuple:
+    """(tree, query_memo) for a site list, built once per list.
+
+    The KD-tree covers the sites' unit-sphere coordinates; chord
+    distance on the unit sphere is monotone in great-circle distance, so
+    nearest-by-chord is nearest-by-haversine exactly, and the chord is
+    converted back to km at query time.
+    """
+    entry = _INDEX_CACHE.get(id(sites))
+    if entry is None or entry[0] is not sites:
+        lat_rad = np.radians(
+            np.fromiter((s["lat"] for s in sites), dtype=np.float64, count=len(sites))
+        )
+        lon_rad = np.radians(
+            np.fromiter((s["lon"] for s in sites), dtype=np.float64, count=len(sites))
+        )
+        tree = cKDTree(_unit_xyz(lat_rad, lon_rad))
+        if len(_INDEX_CACHE) >= _INDEX_CACHE_MAX:
+            _INDEX_CACHE.clear()
+        entry = (sites, tree, {})
+        _INDEX_CACHE[id(sites)] = entry
+    return entry[1], entry[2]
+
+
+def _chord_to_km(chord):
+    return _EARTH_RADIUS_KM * 2.0 * np.arcsin(np.minimum(chord, 2.0) / 2.0)
 
 
 def find_nearest_site(lat: float, lon: float, sites: list) -> tuple:
     """
     Find the site closest to (lat, lon).
 
+    Uses a KD-tree over unit-sphere coordinates (built once per site
+    list), so the lookup is O(log n_sites) instead of a scan.
+
     Returns
     -------
     (site_dict, distance_km)
     """
-    best_site = None
-    best_dist = float("inf")
-    for site in sites:
-        d = haversine_km(lat, lon, site["lat"], site["lon"])
-        if d < best_dist:
-            best_dist = d
-            best_site = site
-    return best_site, best_dist
+    if not sites:
+        return None, float("inf")
+
+    tree, memo = _site_index(sites)
+    hit = memo.get((lat, lon))
+    if hit is not None:
+        return sites[hit[0]], hit[1]
+
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    chord, idx = tree.query(
+        (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+    )
+    idx = int(idx)
+    d_km = float(_chord_to_km(chord))
+
+    if len(memo) >= _QUERY_MEMO_MAX:
+        memo.clear()
+    memo[(lat, lon)] = (idx, d_km)
+    return sites[idx], d_km
+
+
+def find_nearest_sites(lats, lons, sites: list) -> tuple:
+    """
+    Vectorized nearest-site lookup for arrays of query points.
+
+    One batched KD-tree query covers all points, so grid-sized batches
+    avoid both the per-point loop and the full distance matrix.
+
+    Returns
+    -------
+    (indices, distances_km) : tuple of numpy arrays, one entry per point.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    tree, _ = _site_index(sites)
+    chords, indices = tree.query(_unit_xyz(np.radians(lats), np.radians(lons)))
+    return indices, _chord_to_km(chords)
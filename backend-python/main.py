@@ -8,24 +8,48 @@ Four endpoint functions:
     4. simulate_event_and_payout() — fake observation for demos + evaluate payout
 """
 
+import asyncio
 from typing import Optional, Dict, Any
 
+import numpy as np
+
 from lib.premium_math import (
     HAZARD_CONFIG,
     load_site_parameters,
     conditional_expectation_above,
     conditional_expectation_below,
+    conditional_expectation_above_batch,
+    conditional_expectation_below_batch,
 )
 from lib.distributions import build_distribution
-from lib.spatial import find_nearest_site
+from lib.spatial import find_nearest_site, find_nearest_sites
 from lib.fetcher import (
     HAZARD_API_CONFIG,
+    aclose_async_client,
     fetch_latest_observation,
+    fetch_latest_observation_async,
     evaluate_trigger,
 )
 from lib.simulator import simulate_observation
 
 
+# Site-list view of the parameters dict, cached per dict so repeated
+# requests against the (lru-cached) loaded parameters skip rebuilding the
+# list — and, downstream, let lib.spatial reuse its coordinate arrays.
+_SITE_LIST_CACHE: dict = {}
+_SITE_LIST_CACHE_MAX = 8
+
+
+def _site_list(sites: dict) -> list:
+    entry = _SITE_LIST_CACHE.get(id(sites))
+    if entry is None or entry[0] is not sites:
+        if len(_SITE_LIST_CACHE) >= _SITE_LIST_CACHE_MAX:
+            _SITE_LIST_CACHE.clear()
+        entry = (sites, list(sites.values()))
+        _SITE_LIST_CACHE[id(sites)] = entry
+    return entry[1]
+
+
 # ── Endpoint 1: Premium calculation ──────────────────────────────────
 
 def calculate_premium(
@@ -76,7 +100,7 @@ def calculate_premium(
     if sites is None:
         sites = load_site_parameters(site_parameters_path)
 
-    site_list = list(sites.values())
+    site_list = _site_list(sites)
     site, dist_km = find_nearest_site(lat, lon, site_list)
 
     if site is None:
@@ -108,7 +132,7 @@ def calculate_premium(
             "error": "Distribution fit did not converge for this site.",
         }
 
-    dist = build_distribution(family, params)
+    dist = hazard_data.get("_dist") or build_distribution(family, params)
 
     if cfg["direction"] == "high_is_bad":
         exceedance_prob = float(dist.sf(threshold))
@@ -145,6 +169,133 @@ def calculate_premium(
     }
 
 
+def calculate_premium_batch(
+    lats,
+    lons,
+    hazard: str,
+    thresholds,
+    n_months: int = 12,
+    payout: float = 10_000.0,
+    loading_factor: float = 0.20,
+    sites: Optional[dict] = None,
+    site_parameters_path: str = "site_parameters.json",
+) -> list:
+    """
+    Vectorized premium calculation for a portfolio of points.
+
+    All (lat, lon) pairs are snapped to their nearest sites in one
+    broadcast lookup; points sharing a site are then priced together
+    with a single vectorized sf/cdf and conditional-expectation
+    evaluation over their threshold array.
+
+    Parameters
+    ----------
+    lats, lons, thresholds : array-like of float
+        Parallel arrays, one entry per point to price.
+    hazard, n_months, payout, loading_factor, sites, site_parameters_path
+        As in calculate_premium().
+
+    Returns
+    -------
+    list of dicts shaped like calculate_premium(), in input order.
+    """
+    if hazard not in HAZARD_CONFIG:
+        raise ValueError(
+            f"Unknown hazard: '{hazard}'. "
+            f"Choose from: {list(HAZARD_CONFIG.keys())}"
+        )
+
+    cfg = HAZARD_CONFIG[hazard]
+
+    if sites is None:
+        sites = load_site_parameters(site_parameters_path)
+
+    site_list = _site_list(sites)
+    if not site_list:
+        raise ValueError("No sites found in parameters file.")
+
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if not (lats.size == lons.size == thresholds.size):
+        raise ValueError("lats, lons and thresholds must have the same length.")
+
+    indices, dists_km = find_nearest_sites(lats, lons, site_list)
+
+    results: list = [None] * lats.size
+
+    for site_idx in np.unique(indices):
+        site = site_list[site_idx]
+        sel = np.flatnonzero(indices == site_idx)
+
+        def _site_header(i):
+            return {
+                "site_name": site["name"],
+                "city": site["city"],
+                "site_lat": site["lat"],
+                "site_lon": site["lon"],
+                "distance_km": round(float(dists_km[i]), 2),
+                "hazard": hazard,
+            }
+
+        if hazard not in site.get("hazards", {}):
+            for i in sel:
+                results[i] = {
+                    **_site_header(i),
+                    "error": f"No {hazard} parameters available for this site.",
+                }
+            continue
+
+        hazard_data = site["hazards"][hazard]
+        params = hazard_data["params"]
+        family = hazard_data["distribution"]
+
+        if not hazard_data.get("converged", False):
+            for i in sel:
+                results[i] = {
+                    **_site_header(i),
+                    "error": "Distribution fit did not converge for this site.",
+                }
+            continue
+
+        dist = hazard_data.get("_dist") or build_distribution(family, params)
+        thr_group = thresholds[sel]
+
+        if cfg["direction"] == "high_is_bad":
+            exc_probs = np.asarray(dist.sf(thr_group), dtype=np.float64)
+            severities = conditional_expectation_above_batch(dist, thr_group, exc_probs)
+        else:
+            exc_probs = np.asarray(dist.cdf(thr_group), dtype=np.float64)
+            severities = conditional_expectation_below_batch(dist, thr_group, exc_probs)
+
+        for j, i in enumerate(sel):
+            exceedance_prob = float(exc_probs[j])
+            expected_severity = float(severities[j])
+            expected_loss_monthly = exceedance_prob * expected_severity
+            pure_premium = expected_loss_monthly * n_months
+            premium_usdc = exceedance_prob * n_months * payout * (1 + loading_factor)
+
+            results[i] = {
+                **_site_header(i),
+                "distribution": family,
+                "threshold": float(thresholds[i]),
+                "unit": cfg["unit"],
+                "exceedance_prob": round(exceedance_prob, 6),
+                "expected_severity": round(expected_severity, 4),
+                "expected_loss_monthly": round(expected_loss_monthly, 6),
+                "n_months": n_months,
+                "pure_premium": round(pure_premium, 4),
+                "premium_usdc": round(premium_usdc, 2),
+                "payout": payout,
+                "loading_factor": loading_factor,
+                "params": params,
+                "n_obs": hazard_data.get("n_obs", 0),
+                "ks_pvalue": round(hazard_data.get("ks_pvalue", 0.0), 4),
+            }
+
+    return results
+
+
 # ── Endpoint 2: Threshold from exceedance probability ────────────────
 
 def calculate_threshold(
@@ -195,7 +346,7 @@ def calculate_threshold(
     if sites is None:
         sites = load_site_parameters(site_parameters_path)
 
-    site_list = list(sites.values())
+    site_list = _site_list(sites)
     site, dist_km = find_nearest_site(lat, lon, site_list)
 
     if site is None:
@@ -221,7 +372,7 @@ def calculate_threshold(
             "error": "Distribution fit did not converge for this site.",
         }
 
-    dist = build_distribution(family, params)
+    dist = hazard_data.get("_dist") or build_distribution(family, params)
 
     if cfg["direction"] == "high_is_bad":
         # threshold is the (1 - p) quantile: P[X > threshold] = exceedance_prob
@@ -283,32 +434,109 @@ def check_event_and_payout(
 
     trig = evaluate_trigger(observation=obs, threshold=threshold, hazard=hazard)
 
-    if "error" in trig:
-        decision = {
-            "status": "error",
-            "hazard": hazard,
-            "error": trig["error"],
-            "triggered": False,
-            "payout": float(payout),
-            "payout_due": 0.0,
-        }
-    else:
-        payout_due = float(payout) if trig["triggered"] else 0.0
-        decision = {
-            "status": "ok",
-            "hazard": hazard,
-            "date": trig.get("date"),
-            "triggered": bool(trig["triggered"]),
-            "value": float(trig["value"]),
-            "threshold": float(trig["threshold"]),
-            "direction": trig["direction"],
-            "margin": float(trig["margin"]),
-            "payout": float(payout),
-            "payout_due": payout_due,
-        }
+    return _build_payout_decision(obs, trig, lat, lon, hazard, payout)
+
+
+async def check_all_events(
+    sites,
+    hazard: str,
+    threshold: float,
+    payout: float,
+    lookback_months: int = 3,
+) -> list:
+    """
+    Concurrently evaluate check_event_and_payout for many sites.
+
+    Fetches run through the shared async HTTP client and are gathered in
+    one event loop pass, so N sites cost roughly one round trip instead
+    of N.
+
+    Parameters
+    ----------
+    sites : iterable of dicts
+        Each entry needs "lat" and "lon" keys.
+    hazard, threshold, payout, lookback_months
+        As in check_event_and_payout().
+
+    Returns
+    -------
+    list of payout decision dicts, in site order.
+    """
+    async def _one(site):
+        obs = await fetch_latest_observation_async(
+            lat=site["lat"], lon=site["lon"], hazard=hazard, lookback_months=lookback_months
+        )
+        trig = evaluate_trigger(observation=obs, threshold=threshold, hazard=hazard)
+        return _build_payout_decision(obs, trig, site["lat"], site["lon"], hazard, payout)
+
+    return list(await asyncio.gather(*(_one(site) for site in sites)))
+
+
+# Cap concurrent oracle fetches so large batches don't overload the
+# upstream API (the HTTP pool is shared, but the semaphore also bounds
+# in-flight parsing work).
+_MAX_CONCURRENT_CHECKS = 8
+
+
+def check_event_and_payout_many(tasks: list) -> list:
+    """
+    Evaluate many independent (location, hazard) payout checks concurrently.
+
+    Synchronous adapter around the async fetch path: all checks are
+    gathered in one event loop with at most _MAX_CONCURRENT_CHECKS
+    fetches in flight, so N checks cost a few round trips instead of N.
+
+    Parameters
+    ----------
+    tasks : list of dicts
+        Each entry needs "lat", "lon", "hazard", "threshold" and
+        "payout"; "lookback_months" is optional (default 3).
+
+    Returns
+    -------
+    list of payout decision dicts, in task order.
+    """
+    return asyncio.run(_check_many(tasks))
+
+
+async def _check_many(tasks: list) -> list:
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_CHECKS)
+
+    async def _one(task):
+        async with sem:
+            obs = await fetch_latest_observation_async(
+                lat=task["lat"],
+                lon=task["lon"],
+                hazard=task["hazard"],
+                lookback_months=task.get("lookback_months", 3),
+            )
+        trig = evaluate_trigger(observation=obs, threshold=task["threshold"], hazard=task["hazard"])
+        return _build_payout_decision(
+            obs, trig, task["lat"], task["lon"], task["hazard"], task["payout"]
+        )
+
+    try:
+        return list(await asyncio.gather(*(_one(task) for task in tasks)))
+    finally:
+        # This loop dies with asyncio.run; release its pooled connections
+        # rather than leaving them to garbage collection.
+        await aclose_async_client()
 
+
+def _build_payout_decision(
+    obs: dict,
+    trig: dict,
+    lat: float,
+    lon: float,
+    hazard: str,
+    payout: float,
+) -> Dict[str, Any]:
+    payout = float(payout)
+
+    # Observation metadata, spliced into the decision literal below so the
+    # response dict is built in one go instead of via update() passes.
     if "error" not in obs:
-        decision.update({
+        obs_fields = {
             "lat": float(obs.get("lat", lat)),
             "lon": float(obs.get("lon", lon)),
             "unit": obs.get("unit"),
@@ -316,15 +544,39 @@ def check_event_and_payout(
             "aggregation": obs.get("aggregation"),
             "source": obs.get("source"),
             "raw_daily_count": obs.get("raw_daily_count", None),
-        })
+        }
     else:
-        decision.update({
+        obs_fields = {
             "lat": float(lat),
             "lon": float(lon),
             "source": obs.get("source"),
-        })
+        }
 
-    return decision
+    if "error" in trig:
+        return {
+            "status": "error",
+            "hazard": hazard,
+            "error": trig["error"],
+            "triggered": False,
+            "payout": payout,
+            "payout_due": 0.0,
+            **obs_fields,
+        }
+
+    triggered = bool(trig["triggered"])
+    return {
+        "status": "ok",
+        "hazard": hazard,
+        "date": trig.get("date"),
+        "triggered": triggered,
+        "value": float(trig["value"]),
+        "threshold": float(trig["threshold"]),
+        "direction": trig["direction"],
+        "margin": float(trig["margin"]),
+        "payout": payout,
+        "payout_due": payout if triggered else 0.0,
+        **obs_fields,
+    }
 
 
 # ── Endpoint 3: Simulated oracle check + payout ─────────────────────